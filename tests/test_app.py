@@ -2,82 +2,58 @@
 Tests for the Mergington High School API endpoints
 """
 
+import asyncio
+import pickle
+
+import httpx
 import pytest
+import pytest_asyncio
 from fastapi.testclient import TestClient
 from src.app import app, activities
 
+# Pickled snapshot of the app's initial data, restored after each test that mutates it
+_ORIGINAL_ACTIVITIES_BLOB = pickle.dumps(activities, protocol=pickle.HIGHEST_PROTOCOL)
 
-@pytest.fixture
+# Prebuilt endpoint URLs per activity; the email is passed as a query param
+SIGNUP_URLS = {
+    name: httpx.URL(f"/activities/{name}/signup") for name in activities
+}
+UNREGISTER_URLS = {
+    name: httpx.URL(f"/activities/{name}/unregister") for name in activities
+}
+
+
+@pytest.fixture(scope="session")
 def client():
     """Create a test client for the FastAPI application"""
     return TestClient(app)
 
 
-@pytest.fixture(autouse=True)
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def aclient():
+    """Create an async client that calls the FastAPI application in-process"""
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        yield c
+
+
+@pytest.fixture
 def reset_activities():
-    """Reset activities data before each test"""
-    # Store original state
-    original_activities = {
-        "Soccer Team": {
-            "description": "Join the school soccer team and compete in inter-school matches",
-            "schedule": "Tuesdays and Thursdays, 4:00 PM - 6:00 PM",
-            "max_participants": 25,
-            "participants": ["alex@mergington.edu", "ryan@mergington.edu"]
-        },
-        "Basketball Team": {
-            "description": "Practice basketball skills and participate in tournaments",
-            "schedule": "Mondays and Wednesdays, 4:00 PM - 5:30 PM",
-            "max_participants": 15,
-            "participants": ["james@mergington.edu"]
-        },
-        "Art Club": {
-            "description": "Explore various art mediums including painting, drawing, and sculpture",
-            "schedule": "Wednesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 18,
-            "participants": ["emily@mergington.edu", "mia@mergington.edu"]
-        },
-        "Drama Club": {
-            "description": "Participate in theatrical productions and develop acting skills",
-            "schedule": "Fridays, 3:00 PM - 5:30 PM",
-            "max_participants": 20,
-            "participants": ["lucas@mergington.edu", "ava@mergington.edu"]
-        },
-        "Debate Team": {
-            "description": "Develop critical thinking and public speaking skills through competitive debates",
-            "schedule": "Thursdays, 3:30 PM - 5:00 PM",
-            "max_participants": 16,
-            "participants": ["noah@mergington.edu", "isabella@mergington.edu"]
-        },
-        "Science Olympiad": {
-            "description": "Compete in science competitions and conduct experiments",
-            "schedule": "Tuesdays, 3:30 PM - 5:00 PM",
-            "max_participants": 15,
-            "participants": ["ethan@mergington.edu"]
-        },
-        "Chess Club": {
-            "description": "Learn strategies and compete in chess tournaments",
-            "schedule": "Fridays, 3:30 PM - 5:00 PM",
-            "max_participants": 12,
-            "participants": ["michael@mergington.edu", "daniel@mergington.edu"]
-        },
-        "Programming Class": {
-            "description": "Learn programming fundamentals and build software projects",
-            "schedule": "Tuesdays and Thursdays, 3:30 PM - 4:30 PM",
-            "max_participants": 20,
-            "participants": ["emma@mergington.edu", "sophia@mergington.edu"]
-        },
-        "Gym Class": {
-            "description": "Physical education and sports activities",
-            "schedule": "Mondays, Wednesdays, Fridays, 2:00 PM - 3:00 PM",
-            "max_participants": 30,
-            "participants": ["john@mergington.edu", "olivia@mergington.edu"]
-        }
-    }
-    
-    # Reset to original state
-    activities.clear()
-    activities.update(original_activities)
+    """Restore activities data after a test that mutates it"""
     yield
+    activities.clear()
+    activities.update(pickle.loads(_ORIGINAL_ACTIVITIES_BLOB))
+
+
+@pytest.fixture
+def activities_snapshot(client):
+    """Fetch and parse GET /activities once per test"""
+    return client.get("/activities").json()
+
+
+def _participants(activity_name):
+    """Read an activity's participants straight from the in-memory store as a set"""
+    return set(activities[activity_name]["participants"])
 
 
 class TestRootEndpoint:
@@ -96,7 +72,7 @@ class TestGetActivities:
     def test_get_all_activities(self, client):
         """Test retrieving all activities"""
         response = client.get("/activities")
-        assert response.status_code == 200
+        response.raise_for_status()
         
         data = response.json()
         assert isinstance(data, dict)
@@ -104,36 +80,32 @@ class TestGetActivities:
         assert "Soccer Team" in data
         assert "Basketball Team" in data
         
-    def test_activities_have_correct_structure(self, client):
+    def test_activities_have_correct_structure(self, activities_snapshot):
         """Test that activities have all required fields"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        for activity_name, activity_data in data.items():
+        for activity_name, activity_data in activities_snapshot.items():
             assert "description" in activity_data
             assert "schedule" in activity_data
             assert "max_participants" in activity_data
             assert "participants" in activity_data
             assert isinstance(activity_data["participants"], list)
             
-    def test_activities_initial_participants(self, client):
+    def test_activities_initial_participants(self, activities_snapshot):
         """Test that activities have correct initial participants"""
-        response = client.get("/activities")
-        data = response.json()
-        
-        assert len(data["Soccer Team"]["participants"]) == 2
-        assert "alex@mergington.edu" in data["Soccer Team"]["participants"]
+        soccer_participants = activities_snapshot["Soccer Team"]["participants"]
+        assert len(soccer_participants) == 2
+        assert "alex@mergington.edu" in soccer_participants
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestSignupForActivity:
     """Tests for POST /activities/{activity_name}/signup endpoint"""
     
     def test_successful_signup(self, client):
         """Test successful signup for an activity"""
         response = client.post(
-            "/activities/Soccer Team/signup?email=newstudent@mergington.edu"
+            SIGNUP_URLS["Soccer Team"], params={"email": "newstudent@mergington.edu"}
         )
-        assert response.status_code == 200
+        response.raise_for_status()
         
         data = response.json()
         assert "message" in data
@@ -141,51 +113,37 @@ class TestSignupForActivity:
         assert "Soccer Team" in data["message"]
         
         # Verify participant was added
-        activities_response = client.get("/activities")
-        activities_data = activities_response.json()
-        assert "newstudent@mergington.edu" in activities_data["Soccer Team"]["participants"]
-        
-    def test_signup_for_nonexistent_activity(self, client):
-        """Test signup for an activity that doesn't exist"""
-        response = client.post(
-            "/activities/Nonexistent Club/signup?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Activity not found"
+        assert "newstudent@mergington.edu" in _participants("Soccer Team")
         
     def test_duplicate_signup(self, client):
         """Test that a student cannot sign up twice for the same activity"""
         email = "duplicate@mergington.edu"
         
         # First signup should succeed
-        response1 = client.post(f"/activities/Art Club/signup?email={email}")
-        assert response1.status_code == 200
+        response1 = client.post(SIGNUP_URLS["Art Club"], params={"email": email})
+        response1.raise_for_status()
         
         # Second signup should fail
-        response2 = client.post(f"/activities/Art Club/signup?email={email}")
+        response2 = client.post(SIGNUP_URLS["Art Club"], params={"email": email})
         assert response2.status_code == 400
         assert "already signed up" in response2.json()["detail"].lower()
         
     def test_signup_for_full_activity(self, client):
         """Test that signup fails when activity is full"""
         # Fill up Chess Club (max 12 participants, currently has 2)
-        for i in range(10):
-            response = client.post(f"/activities/Chess Club/signup?email=student{i}@mergington.edu")
-            assert response.status_code == 200
-            
+        activities["Chess Club"]["participants"].extend(
+            f"student{i}@mergington.edu" for i in range(10)
+        )
+
         # Try to add one more (should fail)
-        response = client.post("/activities/Chess Club/signup?email=overflow@mergington.edu")
-        assert response.status_code == 400
-        assert "full" in response.json()["detail"].lower()
-        
-    def test_signup_with_special_characters_in_name(self, client):
-        """Test signup for activity with special characters in name"""
         response = client.post(
-            "/activities/Science%20Olympiad/signup?email=science@mergington.edu"
+            SIGNUP_URLS["Chess Club"], params={"email": "overflow@mergington.edu"}
         )
-        assert response.status_code == 200
+        assert response.status_code == 400
+        assert "full" in response.json()["detail"].lower()
 
 
+@pytest.mark.usefixtures("reset_activities")
 class TestUnregisterFromActivity:
     """Tests for DELETE /activities/{activity_name}/unregister endpoint"""
     
@@ -194,33 +152,23 @@ class TestUnregisterFromActivity:
         email = "alex@mergington.edu"
         
         # Verify participant exists
-        activities_response = client.get("/activities")
-        assert email in activities_response.json()["Soccer Team"]["participants"]
+        assert email in _participants("Soccer Team")
         
         # Unregister
-        response = client.delete(f"/activities/Soccer Team/unregister?email={email}")
-        assert response.status_code == 200
+        response = client.delete(UNREGISTER_URLS["Soccer Team"], params={"email": email})
+        response.raise_for_status()
         
         data = response.json()
         assert "message" in data
         assert email in data["message"]
         
         # Verify participant was removed
-        activities_response = client.get("/activities")
-        assert email not in activities_response.json()["Soccer Team"]["participants"]
-        
-    def test_unregister_from_nonexistent_activity(self, client):
-        """Test unregister from an activity that doesn't exist"""
-        response = client.delete(
-            "/activities/Nonexistent Club/unregister?email=student@mergington.edu"
-        )
-        assert response.status_code == 404
-        assert response.json()["detail"] == "Activity not found"
+        assert email not in _participants("Soccer Team")
         
     def test_unregister_not_registered_participant(self, client):
         """Test unregister for a student who is not registered"""
         response = client.delete(
-            "/activities/Soccer Team/unregister?email=notregistered@mergington.edu"
+            UNREGISTER_URLS["Soccer Team"], params={"email": "notregistered@mergington.edu"}
         )
         assert response.status_code == 400
         assert "not registered" in response.json()["detail"].lower()
@@ -231,31 +179,76 @@ class TestUnregisterFromActivity:
         activity = "Drama Club"
         
         # Sign up
-        response1 = client.post(f"/activities/{activity}/signup?email={email}")
-        assert response1.status_code == 200
+        response1 = client.post(SIGNUP_URLS[activity], params={"email": email})
+        response1.raise_for_status()
         
         # Unregister
-        response2 = client.delete(f"/activities/{activity}/unregister?email={email}")
-        assert response2.status_code == 200
+        response2 = client.delete(UNREGISTER_URLS[activity], params={"email": email})
+        response2.raise_for_status()
         
         # Sign up again
-        response3 = client.post(f"/activities/{activity}/signup?email={email}")
-        assert response3.status_code == 200
-        
-    def test_unregister_with_url_encoding(self, client):
-        """Test unregister with URL-encoded activity name"""
-        email = "ethan@mergington.edu"
-        
-        response = client.delete(
-            f"/activities/Science%20Olympiad/unregister?email={email}"
-        )
-        assert response.status_code == 200
-        
-        # Verify participant was removed
-        activities_response = client.get("/activities")
-        assert email not in activities_response.json()["Science Olympiad"]["participants"]
+        response3 = client.post(SIGNUP_URLS[activity], params={"email": email})
+        response3.raise_for_status()
+
 
+@pytest.mark.usefixtures("reset_activities")
+class TestActivityNameInPath:
+    """Tests for how signup and unregister resolve the activity name in the URL"""
+    
+    @pytest.mark.parametrize(
+        "verb,path,expected_status,expected_body,expected_store",
+        [
+            (
+                "post",
+                "/activities/Nonexistent Club/signup?email=student@mergington.edu",
+                404,
+                {"detail": "Activity not found"},
+                None,
+            ),
+            (
+                "delete",
+                "/activities/Nonexistent Club/unregister?email=student@mergington.edu",
+                404,
+                {"detail": "Activity not found"},
+                None,
+            ),
+            (
+                "post",
+                "/activities/Science%20Olympiad/signup?email=science@mergington.edu",
+                200,
+                {"message": "Signed up science@mergington.edu for Science Olympiad"},
+                ("Science Olympiad", "science@mergington.edu", True),
+            ),
+            (
+                "delete",
+                "/activities/Science%20Olympiad/unregister?email=ethan@mergington.edu",
+                200,
+                {"message": "Unregistered ethan@mergington.edu from Science Olympiad"},
+                ("Science Olympiad", "ethan@mergington.edu", False),
+            ),
+        ],
+        ids=[
+            "signup-nonexistent",
+            "unregister-nonexistent",
+            "signup-url-encoded",
+            "unregister-url-encoded",
+        ],
+    )
+    def test_activity_name_in_path(
+        self, client, verb, path, expected_status, expected_body, expected_store
+    ):
+        """Test that unknown activities return 404 and URL-encoded names are decoded"""
+        response = getattr(client, verb)(path)
+        assert response.status_code == expected_status
+        assert response.json() == expected_body
+        
+        # Verify the participant was added or removed in the store
+        if expected_store is not None:
+            activity, email, present = expected_store
+            assert (email in _participants(activity)) == present
 
+
+@pytest.mark.usefixtures("reset_activities")
 class TestIntegrationScenarios:
     """Integration tests for common user scenarios"""
     
@@ -266,38 +259,39 @@ class TestIntegrationScenarios:
         
         # View activities
         response1 = client.get("/activities")
-        assert response1.status_code == 200
+        response1.raise_for_status()
         initial_count = len(response1.json()[activity]["participants"])
         
         # Sign up
-        response2 = client.post(f"/activities/{activity}/signup?email={email}")
-        assert response2.status_code == 200
+        response2 = client.post(SIGNUP_URLS[activity], params={"email": email})
+        response2.raise_for_status()
         
         # Verify signup
-        response3 = client.get("/activities")
-        assert len(response3.json()[activity]["participants"]) == initial_count + 1
-        assert email in response3.json()[activity]["participants"]
+        assert len(activities[activity]["participants"]) == initial_count + 1
+        assert email in _participants(activity)
         
         # Unregister
-        response4 = client.delete(f"/activities/{activity}/unregister?email={email}")
-        assert response4.status_code == 200
+        response4 = client.delete(UNREGISTER_URLS[activity], params={"email": email})
+        response4.raise_for_status()
         
         # Verify unregister
-        response5 = client.get("/activities")
-        assert len(response5.json()[activity]["participants"]) == initial_count
-        assert email not in response5.json()[activity]["participants"]
+        assert len(activities[activity]["participants"]) == initial_count
+        assert email not in _participants(activity)
         
-    def test_multiple_activities_signup(self, client):
+    @pytest.mark.asyncio(loop_scope="session")
+    async def test_multiple_activities_signup(self, aclient):
         """Test that a student can sign up for multiple activities"""
         email = "multitasker@mergington.edu"
         
         activities_to_join = ["Soccer Team", "Art Club", "Chess Club"]
         
-        for activity in activities_to_join:
-            response = client.post(f"/activities/{activity}/signup?email={email}")
-            assert response.status_code == 200
+        responses = await asyncio.gather(*(
+            aclient.post(SIGNUP_URLS[activity], params={"email": email})
+            for activity in activities_to_join
+        ))
+        for response in responses:
+            response.raise_for_status()
             
         # Verify student is in all activities
-        all_activities = client.get("/activities").json()
         for activity in activities_to_join:
-            assert email in all_activities[activity]["participants"]
+            assert email in _participants(activity)